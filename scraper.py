@@ -1,25 +1,140 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.client_config import ClientConfig
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
+    WebDriverException,
     NoSuchElementException,
     StaleElementReferenceException,
 )
+import asyncio
+import atexit
+import contextlib
 import csv
-import time
-import random
+import datetime
+import functools
+import hashlib
+import itertools
 import json
+import logging
+import math
+import os
+import pickle
+import queue
+import re
+
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+import numpy as np
+import orjson
+import urllib3
+
+from urllib.parse import parse_qsl, urlparse, urljoin
+
+log = logging.getLogger(__name__)
+
+
+# Uniqlo's product listing API (the endpoint the "Load more" button hits), used
+# for sections configured with an explicit "api_path". Other sections use the
+# endpoint the listing page itself requests (see find_products_api_request).
+PRODUCTS_API_URL = "https://www.uniqlo.com/my/api/commerce/v5/en/products"
+API_PAGE_SIZE = 36
+# Failed requests, timeouts and non-JSON bodies from the listing API
+API_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ValueError)
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Size of the HTTP connection pool to chromedriver (Selenium defaults to 1)
+POOL_MAXSIZE = 20
+
+# CSS selectors for the product listing, shared by the Python and JS extraction
+SEL = {
+    "card": "article.fr-grid-item.w4",
+    "img": ".fr-product-image img",
+    "size": '[data-test="product-card-size"]',
+    "price": ".fr-product-price",
+    "orig": ".price-original .fr-price-currency span",
+    "limited": ".price-limited .fr-price-currency span",
+    "colors": ".color-tips .color-tip",
+    "title": "h2.description",
+    "offer": ".fr-status-flag-text[data-test^='limited-offer-from']",
+    "flags": "ul.fr-status-flag li",
+    "link": "a",
+}
+LOAD_MORE_XPATH = (
+    "//a[@href='#' and @target='_self'][.//div[contains(@class, 'fr-load-more')]]"
+)
+
+# Number of Chrome instances used to scrape product detail pages in parallel
+DETAIL_POOL_SIZE = 4
+
+# Resources the browser doesn't need to download to scrape the listing
+BLOCKED_URLS = [
+    "*.jpg",
+    "*.jpeg",
+    "*.png",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+]
+
+# Products scraped from each listing page, used when UNIQLO_CACHE is set
+PAGE_CACHE_FILE = os.path.expanduser("~/.cache/uniqlo_scraper.pickle")
+
+_PRICE_RE = re.compile(r"\d+(?:\.\d+)?")
+
+# Disallowed paths according to the website's robot.txt file
+_DISALLOWED = (
+    "/my/en/cms/",
+    "/my/en/search",
+    "/my/en/news/search",
+    "/my/en/news/sp/search",
+)
 
-from urllib.parse import urlparse, urljoin
+# What a dead browser or chromedriver raises: WebDriverException from the
+# session, urllib3 errors (e.g. MaxRetryError) once chromedriver itself is gone
+DRIVER_ERRORS = (WebDriverException, urllib3.exceptions.HTTPError)
 
+_DRIVER = None  # Shared WebDriver instance, reused across scrapes
 
-def setup_driver():
+
+def execute_cdp_cmd(driver, cmd, params):
     """
-    Set up and configure a Chrome WebDriver instance for web scraping.
+    Execute a Chrome DevTools Protocol command. webdriver.Remote has no
+    execute_cdp_cmd method, but the Chromium connection registers the command.
+    Args:
+      driver: The WebDriver instance.
+      cmd (str): The CDP command name, e.g. "Network.enable".
+      params (dict): The command parameters.
+    Returns:
+      dict: The command result.
+    """
+    return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params})[
+        "value"
+    ]
+
+
+def _quit_driver(driver):
+    """
+    Quit a WebDriver instance and stop its chromedriver service.
+    """
+    try:
+        driver.quit()
+    finally:
+        driver.service.stop()
+
+
+def _create_driver():
+    """
+    Create and configure a new Chrome WebDriver instance for web scraping.
     Returns:
       WebDriver: The configured Chrome WebDriver instance.
     """
@@ -34,20 +149,124 @@ def setup_driver():
     chrome_options.add_argument("--start-maximized")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
-    chrome_options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    # Return from driver.get once the DOM is ready; callers wait explicitly
+    # for the elements they need instead of every sub-resource
+    chrome_options.page_load_strategy = "eager"
+    # Only the DOM is scraped, so skip downloading images and fonts. Stylesheets
+    # stay enabled: is_displayed() on the Load more button and innerText in the
+    # extraction script both depend on CSS.
+    chrome_options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+        },
     )
 
     service = Service(r"C:\WebDrivers\chromedriver.exe")  # Change path if needed
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    service.start()
 
-    driver.execute_script(
-        "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-    )
+    # Stop the service (and the session, once started) on any failure below
+    driver = None
+    try:
+        # webdriver.Chrome doesn't accept a client config, so connect to the
+        # chromedriver service through Remote with a larger connection pool
+        client_config = ClientConfig(
+            remote_server_addr=service.service_url,
+            init_args_for_pool_manager={
+                "init_args_for_pool_manager": {"maxsize": POOL_MAXSIZE}
+            },
+        )
+        executor = ChromiumRemoteConnection(
+            remote_server_addr=service.service_url,
+            vendor_prefix="goog",
+            browser_name="chrome",
+            client_config=client_config,
+        )
+        driver = webdriver.Remote(command_executor=executor, options=chrome_options)
+        driver.service = service  # Stopped by _quit_driver
+
+        driver.execute_script(
+            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+        )
+
+        # Block whatever the content settings miss. Image src attributes are
+        # still set on the elements, so product images can be extracted
+        # without loading.
+        execute_cdp_cmd(driver, "Network.enable", {})
+        execute_cdp_cmd(driver, "Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    except BaseException:
+        if driver is not None:
+            try:
+                _quit_driver(driver)
+            except Exception:
+                service.stop()
+        else:
+            service.stop()
+        raise
 
     return driver
 
 
+def setup_driver():
+    """
+    Return the shared Chrome WebDriver instance, creating it on first use or
+    when the previous session has been lost.
+    Returns:
+      WebDriver: The configured Chrome WebDriver instance.
+    """
+    global _DRIVER
+
+    if _DRIVER is not None and _DRIVER.session_id is not None:
+        try:
+            _DRIVER.current_url  # Raises if the browser session is gone
+            return _DRIVER
+        except DRIVER_ERRORS:
+            log.warning("Driver session lost, starting a new one...")
+            try:
+                _quit_driver(_DRIVER)
+            except DRIVER_ERRORS:
+                pass  # The session is already gone
+
+    _DRIVER = _create_driver()
+    return _DRIVER
+
+
+def reset_driver(driver):
+    """
+    Clear the state left behind by a scrape so the driver can be reused.
+    A dead driver is left for setup_driver to replace.
+    """
+    try:
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+    except DRIVER_ERRORS as e:
+        log.warning("Error resetting driver: %s", e)
+
+
+def shutdown_driver():
+    """
+    Quit the shared WebDriver instance, if one is running. Registered with
+    atexit, so library callers don't leak Chrome if they never call it.
+    """
+    global _DRIVER
+
+    if _DRIVER is None:
+        return
+
+    try:
+        _quit_driver(_DRIVER)
+    except DRIVER_ERRORS as e:
+        log.error("Error closing driver: %s", e)
+    _DRIVER = None
+    log.info("Driver closed")
+
+
+atexit.register(shutdown_driver)
+
+
+@functools.lru_cache(maxsize=4096)
 def is_allowed(url):
     """
     Check if a given URL is allowed based on the path.
@@ -57,18 +276,7 @@ def is_allowed(url):
       bool: True if the URL is allowed, False otherwise.
     """
 
-    parsed_url = urlparse(url)
-    path = parsed_url.path
-
-    # Disallowed paths according to the website's robot.txt file
-    disallowed_paths = [
-        "/my/en/cms/",
-        "/my/en/search",
-        "/my/en/news/search",
-        "/my/en/news/sp/search",
-    ]
-
-    return not any(path.startswith(disallowed) for disallowed in disallowed_paths)
+    return not urlparse(url).path.startswith(_DISALLOWED)
 
 
 def load_config(config_file="config.json"):
@@ -79,72 +287,154 @@ def load_config(config_file="config.json"):
         return json.load(f)
 
 
+# Counts product cards appended to the page, so waits can end as soon as a
+# "Load more" batch has rendered
+OBSERVE_NEW_CARDS_JS = """
+const cardSelector = arguments[0];
+window.__newCards = 0;
+// Cards can arrive on their own or inside a wrapper node, so count both
+new MutationObserver(ms => ms.forEach(m => m.addedNodes.forEach(n => {
+  if (n.nodeType !== Node.ELEMENT_NODE) return;
+  window.__newCards += n.matches(cardSelector)
+    ? 1
+    : n.querySelectorAll(cardSelector).length;
+}))).observe(document.body, {childList: true, subtree: true});
+"""
+
+
 def scroll_and_click_load_more(driver):
     """
-    Scroll to the bottom of the page and click 'Load more' button
-    to load more products
+    Click the 'Load more' button until every product is loaded, waiting for
+    each batch of new product cards instead of sleeping between clicks
+    Returns:
+      bool: True if the button ran out, False if loading stopped early and
+        the listing may be incomplete.
     """
 
     load_more_count = 0
+    complete = True
 
-    load_more_xpath = (
-        "//a[@href='#' and @target='_self'][.//div[contains(@class, 'fr-load-more')]]"
-    )
+    driver.execute_script(OBSERVE_NEW_CARDS_JS, SEL["card"])
 
     while True:
         driver.execute_script(
             "window.scrollTo(0, document.body.scrollHeight);"
-        )  # Scroll to bottom of page
-        time.sleep(random.uniform(2, 4))
-
-        print(
-            f"Current page height: {driver.execute_script('return document.body.scrollHeight')}"
-        )
+        )  # Scroll to bottom of page so the button renders
 
         try:
             load_more_button = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, load_more_xpath))
+                EC.presence_of_element_located((By.XPATH, LOAD_MORE_XPATH))
             )
-            print(f"Load more button found: {load_more_button.is_displayed()}")
+            displayed = load_more_button.is_displayed()
+            log.debug("Load more button found: %s", displayed)
 
-            if not load_more_button.is_displayed():
-                print("Load more button is not visible")
+            if not displayed:
+                log.debug("Load more button is not visible")
                 break
 
+            prev_cards = driver.execute_script("return window.__newCards")
             driver.execute_script("arguments[0].scrollIntoView();", load_more_button)
-            time.sleep(random.uniform(1, 2))
             load_more_button.click()
             load_more_count += 1
-            print(f"Clicked 'Load more' button {load_more_count} times")
-            time.sleep(random.uniform(2, 4))
+            log.debug("Clicked 'Load more' button %d times", load_more_count)
 
         except TimeoutException:
-            print("Timeout waiting for 'Load more' button")
+            log.debug("Timeout waiting for 'Load more' button")
             break
         except NoSuchElementException:
-            print("'Load more' button not found")
+            log.debug("'Load more' button not found")
             break
         except StaleElementReferenceException:
-            print("Page structure changed, retrying...")
-            time.sleep(random.uniform(1, 2))
+            log.debug("Page structure changed, retrying...")
             continue
         except Exception as e:
-            print(f"Unexpected error: {str(e)}")
+            log.error("Unexpected error: %s", e)
+            complete = False
             break
 
-        print(
-            f"Finished loading more products. Clicked {load_more_count} times in total."
-        )
+        try:
+            WebDriverWait(driver, 15).until(
+                lambda d: d.execute_script("return window.__newCards") > prev_cards
+            )
+        except TimeoutException:
+            log.warning(
+                "Timeout waiting for more products to load, the listing may be incomplete"
+            )
+            complete = False
+            break
+
+    log.info(
+        "Finished loading more products. Clicked %d times in total.", load_more_count
+    )
+    return complete
+
+
+# Walks every product card in the browser and returns the raw fields in one
+# WebDriver round trip, instead of one round trip per element lookup.
+EXTRACT_PRODUCTS_JS = """
+function(sel) {
+  const text = (el) => (el ? el.innerText.trim() : null);
+  const last = (els) => (els.length ? text(els[els.length - 1]) : null);
+  return Array.from(document.querySelectorAll(sel.card)).map(p => {
+    const price = p.querySelector(sel.price);
+    return {
+      id: p.dataset.test || '',
+      title: text(p.querySelector(sel.title)),
+      img: p.querySelector(sel.img)?.src ?? null,
+      colors: Array.from(p.querySelectorAll(sel.colors))
+        .filter(tip => !tip.classList.contains('extra')).length,
+      size: text(p.querySelector(sel.size)),
+      orig: price ? last(price.querySelectorAll(sel.orig)) : null,
+      sale: price ? last(price.querySelectorAll(sel.limited)) : null,
+      limited: text(p.querySelector(sel.offer)),
+      flags: Array.from(p.querySelectorAll(sel.flags))
+        .filter(li => !(li.dataset.test || '').includes('limited-offer'))
+        .map(li => li.innerText.trim()),
+      href: p.querySelector(sel.link)?.href ?? null,
+    };
+  });
+}
+"""
+# Evaluated through CDP, which takes no arguments, so the selectors are inlined
+EXTRACT_PRODUCTS_EXPRESSION = f"({EXTRACT_PRODUCTS_JS})({orjson.dumps(SEL).decode()})"
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_price(price):
+    """
+    Parse a price string such as "RM1,299.90" into a float.
+    Returns:
+      float: The price, or None if the string contains no number.
+    """
+    match = _PRICE_RE.search(price.replace(",", ""))
+    return float(match.group(0)) if match else None
 
 
-def extract_product_info(product, base_url):
+def _compute_discounts(original_prices, sale_prices):
     """
-    Extracts information about a product from a web page.
+    Compute discount percentages for parallel lists of prices in one
+    vectorized pass.
     Args:
-      product: WebElement object representing the product.
-      base_url: Base URL of the web page.
+      original_prices (list): Original prices, None where missing.
+      sale_prices (list): Sale prices, None where missing.
     Returns:
-      A dictionary containing the extracted product information, including:
+      numpy.ndarray: Discount percentages rounded to 2 decimal places, NaN
+        where either price is missing or the original price is zero.
+    """
+    op = np.array(original_prices, dtype=np.float64)
+    sp = np.array(sale_prices, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(op > 0, np.round((op - sp) / op * 100, 2), np.nan)
+
+
+def extract_all_products(driver, base_url):
+    """
+    Extracts information about every product card on the page.
+    Args:
+      driver: The WebDriver instance.
+      base_url: Base URL of the web page.
+    Yields:
+      A dictionary per product containing the extracted product information, including:
       - product_id: ID of the product.
       - title: Title of the product.
       - image: URL of the product image.
@@ -157,258 +447,689 @@ def extract_product_info(product, base_url):
       - additional_info: Additional information about the product.
       - product_url: URL of the product page.
     """
-    # TODO: Fix the logic for extracting product information
-    # The discount information is akways null
-    try:
-        product_id = product.get_attribute("data-test").split("product-card-")[-1]
-        image = product.find_element(
-            By.CSS_SELECTOR, ".fr-product-image img"
-        ).get_attribute("src")
-
-        # Color options (accounting for "extra" option)
-        color_tips = product.find_elements(By.CSS_SELECTOR, ".color-tips .color-tip")
-        color_options = sum(
-            1 for tip in color_tips if "extra" not in tip.get_attribute("class")
+    # Runtime.evaluate returns the JSON value directly, skipping the argument
+    # and element marshalling of execute_script
+    result = execute_cdp_cmd(
+        driver,
+        "Runtime.evaluate",
+        {
+            "expression": EXTRACT_PRODUCTS_EXPRESSION,
+            "returnByValue": True,
+            "awaitPromise": False,
+        },
+    )
+    if "exceptionDetails" in result:
+        raise WebDriverException(
+            f"Product extraction script failed: {result['exceptionDetails'].get('text')}"
         )
+    raw_products = result["result"]["value"]
+    log.info("Found %d products", len(raw_products))
 
-        title = product.find_element(By.CSS_SELECTOR, "h2.description").text.strip()
+    # Discount calculation for the whole page in one pass, converted back to
+    # plain floats once so the loop below doesn't touch NumPy scalars
+    discounts = _compute_discounts(
+        [_parse_price(raw["orig"]) if raw["orig"] else None for raw in raw_products],
+        [_parse_price(raw["sale"]) if raw["sale"] else None for raw in raw_products],
+    ).tolist()
 
-        # Size information
-        size_info = product.find_element(
-            By.CSS_SELECTOR, '[data-test="product-card-size"]'
-        ).text.strip()
+    for i, (raw, page_discount) in enumerate(zip(raw_products, discounts), 1):
+        try:
+            original_price = raw["orig"] or None
+            sale_price = raw["sale"] or None
+
+            discount = None
+            if original_price and sale_price:
+                if math.isnan(page_discount):
+                    log.warning(
+                        "Error converting prices to float: original_price=%s, sale_price=%s",
+                        original_price,
+                        sale_price,
+                    )
+                else:
+                    discount = page_discount
+
+            if not raw["href"]:
+                # urljoin would fall back to the listing URL itself
+                log.warning("Skipping product card without a link: %s", raw["id"])
+                continue
+
+            product_url = urljoin(base_url, raw["href"])
+
+            if not is_allowed(product_url):
+                log.info("Skipping disallowed URL: %s", product_url)
+                continue
+
+            product_info = {
+                "product_id": raw["id"].split("product-card-")[-1],
+                "title": raw["title"],
+                "image": raw["img"],
+                "color_options": raw["colors"],
+                "size_info": raw["size"],
+                "original_price": original_price,
+                "sale_price": sale_price,
+                "discount": f"{discount}%" if discount is not None else None,
+                "limited_offer": raw["limited"],
+                "additional_info": raw["flags"],
+                "product_url": product_url,
+            }
+
+            log.debug("Extracted product %s", product_info["product_id"])
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("full=%r", product_info)
+            yield product_info
 
-        price_element = product.find_element(By.CSS_SELECTOR, ".fr-product-price")
+        except Exception as e:
+            log.error("Error extracting product info: %s", e)
 
-        # Price extraction (handling both original and limited price)
-        original_price = None
-        sale_price = None
+        log.debug("Processed product %d/%d", i, len(raw_products))
 
-        original_price_element = price_element.find_elements(
-            By.CSS_SELECTOR, ".price-original .fr-price-currency span"
-        )
-        if original_price_element:
-            original_price = original_price_element[-1].text.strip()
 
-        limited_price_element = price_element.find_elements(
-            By.CSS_SELECTOR, ".price-limited .fr-price-currency span"
-        )
-        if limited_price_element:
-            sale_price = limited_price_element[-1].text.strip()
+def _api_price(price):
+    """
+    Convert a price value from the listing API into a float.
+    Returns:
+      float: The price, or None if it is missing or not numeric.
+    """
+    if isinstance(price, str):
+        return _parse_price(price)
+    try:
+        return float(price)
+    except (TypeError, ValueError):
+        return None
 
-        if not sale_price:
-            sale_price = None
 
-        # Discount calculation
-        discount = None
-        if original_price and sale_price:
-            try:
-                original_price_float = float(
-                    original_price.replace(",", "").replace("RM", "")
-                )
-                sale_price_float = float(sale_price.replace(",", "").replace("RM", ""))
-                discount = round(
-                    (original_price_float - sale_price_float)
-                    / original_price_float
-                    * 100,
-                    2,
-                )
-            except ValueError:
-                print(
-                    f"Error converting prices to float: original_price={original_price}, sale_price={sale_price}"
-                )
+def parse_api_product(item, base_url):
+    """
+    Convert a product from the listing API response into the same schema
+    produced by extract_all_products.
+    Args:
+      item (dict): A product entry from the API's result.items list.
+      base_url: Base URL of the listing page.
+    Returns:
+      A dictionary containing the product information, or None if the
+      product URL is disallowed.
+    """
+    product_id = item.get("productId")
 
-        # Limited offer extraction
-        limited_offer = product.find_elements(
-            By.CSS_SELECTOR, ".fr-status-flag-text[data-test^='limited-offer-from']"
-        )
-        limited_offer = limited_offer[0].text.strip() if limited_offer else None
-
-        # Additional product information (may not be needed!)
-        additional_info = product.find_elements(By.CSS_SELECTOR, "ul.fr-status-flag li")
-        additional_info = [
-            info.text.strip()
-            for info in additional_info
-            if "limited-offer" not in info.get_attribute("data-test")
-        ]
-
-        product_url = urljoin(
-            base_url, product.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
-        )
+    images = item.get("images", {}).get("main") or {}
+    if isinstance(images, dict):
+        images = list(images.values())
+    image = images[0].get("image") if images else None
+
+    sizes = [size.get("name") for size in item.get("sizes", [])]
+    size_info = f"{sizes[0]}-{sizes[-1]}" if len(sizes) > 1 else "".join(sizes)
 
-        if not is_allowed(product_url):
-            print(f"Skipping disallowed URL: {product_url}")
-            return None
-
-        product_info = {
-            "product_id": product_id,
-            "title": title,
-            "image": image,
-            "color_options": color_options,
-            "size_info": size_info,
-            "original_price": original_price,
-            "sale_price": sale_price,
-            "discount": f"{discount}%" if discount is not None else None,
-            "limited_offer": limited_offer,
-            "additional_info": additional_info,
-            "product_url": product_url,
-        }
-
-        print(f"Extracted product info: {product_info}")  # Sanity check
-        return product_info
-
-    except Exception as e:
-        print(f"Error extracting product info: {str(e)}")
+    prices = item.get("prices", {})
+    base_price = _api_price((prices.get("base") or {}).get("value"))
+    promo_price = _api_price((prices.get("promo") or {}).get("value"))
+    currency = ((prices.get("base") or {}).get("currency") or {}).get("symbol", "RM")
+
+    original_price = f"{currency}{base_price:.2f}" if base_price else None
+    sale_price = f"{currency}{promo_price:.2f}" if promo_price else None
+
+    # Discount calculation
+    discount = None
+    if base_price and promo_price:
+        discount = round((base_price - promo_price) / base_price * 100, 2)
+
+    flags = item.get("flags", {})
+    price_flags = [flag.get("name") for flag in flags.get("priceFlags", [])]
+    limited_offer = price_flags[0] if price_flags else None
+    additional_info = [flag.get("name") for flag in flags.get("productFlags", [])]
+
+    product_url = urljoin(
+        base_url, f"/my/en/products/{product_id}/{item.get('priceGroup', '00')}"
+    )
+
+    if not is_allowed(product_url):
+        log.info("Skipping disallowed URL: %s", product_url)
         return None
 
+    return {
+        "product_id": product_id,
+        "title": item.get("name"),
+        "image": image,
+        "color_options": len(item.get("colors", [])),
+        "size_info": size_info,
+        "original_price": original_price,
+        "sale_price": sale_price,
+        "discount": f"{discount}%" if discount is not None else None,
+        "limited_offer": limited_offer,
+        "additional_info": additional_info,
+        "product_url": product_url,
+    }
+
+
+async def fetch_products_page(session, api_url, params, offset):
+    """
+    Fetch a single page of products from the listing API.
+    Args:
+      session (aiohttp.ClientSession): The HTTP session to use.
+      api_url (str): The listing API endpoint.
+      params (dict): Query parameters captured from the listing page's XHR.
+      offset (int): Offset of the first product on the page.
+    Returns:
+      dict: The "result" object of the API response.
+    """
+    page_params = {**params, "offset": offset, "limit": API_PAGE_SIZE}
+    async with session.get(api_url, params=page_params) as response:
+        response.raise_for_status()
+        data = await response.json(content_type=None)
+    if not isinstance(data, dict):
+        raise ValueError(f"Unexpected product API response from {api_url}")
+    return data.get("result") or {}
+
+
+async def fetch_api_products(api_url, params, base_url, cookies=None):
+    """
+    Fetch every page of the listing API concurrently and parse the products.
+    Args:
+      api_url (str): The listing API endpoint.
+      params (dict): Query parameters captured from the listing page's XHR.
+      base_url: Base URL of the listing page.
+      cookies (dict): Cookies to send with each request, if any.
+    Returns:
+      list: A list of dictionaries containing information about the products.
+    """
+    async with aiohttp.ClientSession(
+        headers={"User-Agent": USER_AGENT}, cookies=cookies
+    ) as session:
+        first_page = await fetch_products_page(session, api_url, params, 0)
+        total = (first_page.get("pagination") or {}).get("total") or 0
+        log.info("Found %d products", total)
+
+        remaining_pages = await asyncio.gather(
+            *(
+                fetch_products_page(session, api_url, params, offset)
+                for offset in range(API_PAGE_SIZE, total, API_PAGE_SIZE)
+            )
+        )
+
+    products = []
+    for page in [first_page, *remaining_pages]:
+        for item in page.get("items") or []:
+            product_info = parse_api_product(item, base_url)
+            if product_info:
+                products.append(product_info)
+
+    return products
+
 
-def scrape_uniqlo_women_tops(url):
+async def fetch_api_signature(api_url, params, cookies=None):
+    """
+    Fetch the first page of the listing API to tell whether a listing changed.
+    Args:
+      api_url (str): The listing API endpoint.
+      params (dict): Query parameters captured from the listing page's XHR.
+      cookies (dict): Cookies to send with the request, if any.
+    Returns:
+      list: The listing's product total followed by the first page's product ids.
+    """
+    async with aiohttp.ClientSession(
+        headers={"User-Agent": USER_AGENT}, cookies=cookies
+    ) as session:
+        first_page = await fetch_products_page(session, api_url, params, 0)
+
+    total = (first_page.get("pagination") or {}).get("total")
+    items = first_page.get("items") or []
+    return [total, *(item.get("productId") for item in items)]
+
+
+def scrape_uniqlo_women_tops(url, api_path=None):
     """
     Scrapes the Uniqlo website for women's tops using the provided URL.
+    Products are fetched from the product listing API; without an api_path,
+    the listing page is loaded once to find the API request it makes.
     Args:
       url (str): The URL of the Uniqlo website to scrape.
+      api_path (str): The "path" query parameter of the listing's product API
+        request, if known (visible in DevTools' Network tab).
     Returns:
       list: A list of dictionaries containing information about the scraped products.
     """
-    pass
 
     if not is_allowed(url):
-        print("Not allowed to scrape")
+        log.warning("Not allowed to scrape: %s", url)
         return []
 
-    driver = setup_driver()
-    driver.get(url)
-    print(f"Navigated to... {url}")  # Sanity check
-
-    time.sleep(10)
-
-    print(
-        f"Initial page height: {driver.execute_script('return document.body.scrollHeight')}"
-    )
-    print(
-        f"Page title: {driver.title}"
-    )  # This will help confirm if the page loaded correctly
+    if api_path is None:
+        driver = setup_driver()
+        try:
+            return list(scrape_uniqlo_section(driver, {"url": url}))
+        finally:
+            reset_driver(driver)
 
-    scroll_and_click_load_more(driver)  # Load all products before extracting it
+    try:
+        return asyncio.run(
+            fetch_api_products(PRODUCTS_API_URL, {"path": api_path}, url)
+        )
+    except API_ERRORS as e:
+        log.error("Error fetching products from API: %s", e)
+        return []
 
-    product_list = driver.find_elements(By.CSS_SELECTOR, "article.fr-grid-item.w4")
-    print(f"Found {len(product_list)} products")  # Sanity check
 
-    products = []
-    for i, product in enumerate(product_list, 1):
-        product_info = extract_product_info(product, url)
-        if product_info:
-            products.append(product_info)
-        print(f"Processed product {i}/{len(product_list)}")  # Sanity check
+def find_products_api_request(driver):
+    """
+    Find the product listing API request the page made while loading.
+    Args:
+      driver: The WebDriver instance.
+    Returns:
+      tuple: The API endpoint and its query parameters (without offset and
+        limit), or None if the page didn't call the API.
+    """
+    entries = driver.execute_script(
+        "return performance.getEntriesByType('resource').map(e => e.name)"
+    )
 
-    driver.quit()
-    print("Driver closed")  # Sanity check
+    # Only the paginated listing endpoint: ".../products?path=...". Product,
+    # price and recommendation calls share the prefix but not this shape.
+    for entry in entries:
+        parsed_url = urlparse(entry)
+        params = dict(parse_qsl(parsed_url.query))
+        is_listing = "/api/" in parsed_url.path and parsed_url.path.endswith(
+            "/products"
+        )
+        if is_listing and params.get("path"):
+            break
+    else:
+        return None
 
-    return products
+    api_url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
+    params.pop("offset", None)
+    params.pop("limit", None)
+    return api_url, params
 
 
-def save_to_csv(products, filename):
+def save_stream(products, csv_filename, jsonl_filename):
     """
-    Save a list of products to a CSV file.
+    Save products to a CSV file and a JSON Lines file as they are produced,
+    without holding the full list in memory.
     Args:
-      products (list): A list of dictionaries representing products.
-      filename (str): The name of the CSV file to save.
+      products (iterable): An iterable of dictionaries representing products.
+      csv_filename (str): The name of the CSV file to save.
+      jsonl_filename (str): The name of the JSON Lines file to save.
+    Returns:
+      int: The number of products saved.
     """
+    products = iter(products)
+    first_product = next(products, None)
+
+    if first_product is None:
+        log.info("No products to save.")
+        return 0
+
+    count = 0
+    keys = list(first_product.keys())
+    with open(csv_filename, "w", newline="", encoding="utf-8") as csv_file, open(
+        jsonl_filename, "wb"
+    ) as jsonl_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(keys)
+
+        for product in itertools.chain([first_product], products):
+            writer.writerow([product[key] for key in keys])
+            jsonl_file.write(
+                orjson.dumps(product, option=orjson.OPT_APPEND_NEWLINE)
+            )
+            count += 1
 
-    if not products:
-        print("No products to save.")
-        return
-
-    keys = products[0].keys()
-    with open(filename, "w", newline="", encoding="utf-8") as output_file:
-        dict_writer = csv.DictWriter(output_file, keys)
-        dict_writer.writeheader()
-        dict_writer.writerows(products)
-    print(f"Saved {len(products)} products to {filename}")  # Sanity check
+    log.info("Saved %d products to %s and %s", count, csv_filename, jsonl_filename)
+    return count
 
 
-def save_to_json(products, filename):
+def merge_jsonl_to_json(section_files, filename):
     """
-    Save a list of products to a JSON file.
+    Combine per-section JSON Lines files into a single JSON file mapping each
+    section name to its list of products, copying one line at a time.
     Args:
-      products (list): A list of dictionaries representing products.
+      section_files (dict): Section names mapped to their JSON Lines file names
+        (or None for sections without products).
       filename (str): The name of the JSON file to save.
     """
-    if not products:
-        print("No products to save.")
-        return
+    with open(filename, "wb") as output_file:
+        output_file.write(b"{")
+        for i, (section_name, jsonl_filename) in enumerate(section_files.items()):
+            if i:
+                output_file.write(b",")
+            output_file.write(orjson.dumps(section_name) + b":[")
 
-    with open(filename, "w", encoding="utf-8") as output_file:
-        json.dump(products, output_file, ensure_ascii=False, indent=4)
-    print(f"Saved {len(products)} products to {filename}")  # Sanity check
+            if jsonl_filename is not None:  # None when the section had no products
+                with open(jsonl_filename, "rb") as jsonl_file:
+                    for j, line in enumerate(jsonl_file):
+                        if j:
+                            output_file.write(b",")
+                        output_file.write(line.rstrip(b"\n"))
+
+            output_file.write(b"]")
+        output_file.write(b"}")
+    log.info("Saved all sections to %s", filename)
 
 
 def scrape_uniqlo_section(driver, section_config):
     """
     Scrapes a specific section of the Uniqlo website using the provided configuration.
+    Set the UNIQLO_CACHE environment variable to reuse the products of an
+    earlier run on the same day when the listing is unchanged.
     Args:
       driver: The WebDriver instance.
       section_config (dict): Configuration for the section to be scraped.
-    Returns:
-      list: A list of dictionaries containing information about the scraped products.
+    Yields:
+      dict: Information about each scraped product.
     """
     url = section_config["url"]
 
     if not is_allowed(url):
-        print(f"Not allowed to scrape: {url}")
-        return []
+        log.warning("Not allowed to scrape: %s", url)
+        return
 
     driver.get(url)
-    print(f"Navigated to... {url}")  # Sanity check
+    log.info("Navigated to... %s", url)
 
-    time.sleep(10)
+    try:
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, SEL["card"]))
+        )
+    except TimeoutException:
+        log.error("Timeout waiting for products to load")
+        return
 
-    print(
-        f"Initial page height: {driver.execute_script('return document.body.scrollHeight')}"
-    )
-    print(
-        f"Page title: {driver.title}"
-    )  # This will help confirm if the page loaded correctly
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            "Initial page height: %s",
+            driver.execute_script("return document.body.scrollHeight"),
+        )
+        # This will help confirm if the page loaded correctly
+        log.debug("Page title: %s", driver.title)
 
-    scroll_and_click_load_more(driver)  # Load all products before extracting them
+    if not os.getenv("UNIQLO_CACHE"):
+        yield from _scrape_loaded_section(driver, url)
+        return
 
-    product_list = driver.find_elements(By.CSS_SELECTOR, "article.fr-grid-item.w4")
-    print(f"Found {len(product_list)} products")  # Sanity check
+    # Reuse today's products from a previous run if the listing hasn't changed
+    cache_key = (url, datetime.date.today().isoformat())
+    page_hash = hashlib.sha1(orjson.dumps(_listing_signature(driver))).hexdigest()
+    cached = _load_page_cache().get(cache_key)
+    if cached and cached[0] == page_hash and cached[1]:
+        log.info("Listing unchanged, using %d cached products", len(cached[1]))
+        yield from cached[1]
+        return
 
     products = []
-    for i, product in enumerate(product_list, 1):
-        product_info = extract_product_info(product, url)
-        if product_info:
-            products.append(product_info)
-        print(f"Processed product {i}/{len(product_list)}")  # Sanity check
+    complete = yield from _recording(_scrape_loaded_section(driver, url), products)
 
-    return products
+    # Don't let an empty or partial listing stand in for the real one all day
+    if not (complete and products):
+        log.info("Listing incomplete, not caching its products")
+        return
+
+    # Entries expire at the end of the day they were scraped
+    cache = {
+        key: value
+        for key, value in _load_page_cache().items()
+        if isinstance(key, tuple) and key[1] == cache_key[1]
+    }
+    cache[cache_key] = (page_hash, products)
+    _save_page_cache(cache)
+
+
+def _listing_signature(driver):
+    """
+    Summarise a loaded listing page in a way that doesn't depend on how far
+    it has rendered: the product API's total and first page of product ids,
+    or the ids of the rendered product cards if the API isn't available.
+    """
+    api_request = find_products_api_request(driver)
+    if api_request:
+        api_url, params = api_request
+        cookies = {cookie["name"]: cookie["value"] for cookie in driver.get_cookies()}
+        try:
+            return asyncio.run(fetch_api_signature(api_url, params, cookies))
+        except API_ERRORS as e:
+            log.warning("Error fetching listing signature from API: %s", e)
+
+    return driver.execute_script(
+        "return Array.from(document.querySelectorAll(arguments[0]))"
+        ".map(p => p.dataset.test)",
+        SEL["card"],
+    )
+
+
+def _scrape_loaded_section(driver, url):
+    """
+    Scrapes the products of a listing page that has already been loaded.
+    Args:
+      driver: The WebDriver instance.
+      url (str): The URL of the listing page.
+    Yields:
+      dict: Information about each scraped product.
+    Returns:
+      bool: False if loading stopped early and the listing may be incomplete.
+    """
+    # Fetch the products straight from the API the page uses, if it can be found
+    api_request = find_products_api_request(driver)
+    if api_request:
+        api_url, params = api_request
+        log.info("Found product API: %s", api_url)
+        cookies = {cookie["name"]: cookie["value"] for cookie in driver.get_cookies()}
+        try:
+            products = asyncio.run(fetch_api_products(api_url, params, url, cookies))
+        except API_ERRORS as e:
+            log.warning("Error fetching products from API, falling back: %s", e)
+        else:
+            if products:
+                yield from products
+                return True
+            log.warning("Product API returned no products, falling back")
+
+    # Load all products before extracting them
+    complete = scroll_and_click_load_more(driver)
+
+    yield from extract_all_products(driver, url)
+    return complete
+
+
+def _recording(generator, items):
+    """
+    Yield everything from a generator, appending each item to a list.
+    Returns:
+      The generator's return value.
+    """
+    while True:
+        try:
+            item = next(generator)
+        except StopIteration as stop:
+            return stop.value
+        items.append(item)
+        yield item
+
+
+def _load_page_cache():
+    """
+    Load the listing page cache, mapping (URL, date) to (listing hash, products).
+    """
+    try:
+        with open(PAGE_CACHE_FILE, "rb") as f:
+            return pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return {}
+
+
+def _save_page_cache(cache):
+    """
+    Save the listing page cache.
+    """
+    os.makedirs(os.path.dirname(PAGE_CACHE_FILE), exist_ok=True)
+    with open(PAGE_CACHE_FILE, "wb") as f:
+        pickle.dump(cache, f)
+
+
+# Reads the product page's structured data (JSON-LD) in one WebDriver round trip
+EXTRACT_DETAIL_JS = """
+function() {
+  const ld = Array.from(document.querySelectorAll('script[type="application/ld+json"]'))
+    .map(s => { try { return JSON.parse(s.textContent); } catch (e) { return null; } })
+    .find(d => d && d['@type'] === 'Product');
+  return {
+    title: document.querySelector('h1')?.innerText.trim() ?? null,
+    description: ld?.description
+      ?? document.querySelector('meta[name="description"]')?.content ?? null,
+    sku: ld?.sku ?? null,
+    rating: ld?.aggregateRating?.ratingValue ?? null,
+    review_count: ld?.aggregateRating?.reviewCount ?? null,
+  };
+}
+"""
+
+
+class DriverPool:
+    """
+    A fixed set of Chrome WebDriver instances shared between worker threads.
+    """
+
+    def __init__(self, size=DETAIL_POOL_SIZE):
+        self._drivers = queue.Queue()
+        try:
+            for _ in range(size):
+                self._drivers.put(_create_driver())
+        except BaseException:
+            self.close()  # Don't leak the drivers that did start
+            raise
+
+    @contextlib.contextmanager
+    def driver(self):
+        """
+        Borrow a driver for one job, waiting until one is free. The driver
+        always goes back to the pool, replaced if its browser has died.
+        """
+        driver = self._drivers.get()
+        try:
+            yield driver
+        finally:
+            try:
+                driver.delete_all_cookies()  # Don't leak state between jobs
+            except DRIVER_ERRORS:
+                driver = self._replace(driver)
+            finally:
+                self._drivers.put(driver)
+
+    def _replace(self, driver):
+        """
+        Swap a dead driver for a new one. If that fails, the dead driver is
+        returned so the pool never shrinks and waiting workers never block.
+        """
+        log.warning("Pool driver session lost, starting a new one...")
+        try:
+            _quit_driver(driver)
+        except Exception:
+            pass  # The session is already gone
+
+        try:
+            return _create_driver()
+        except Exception as e:
+            log.error("Error starting replacement driver: %s", e)
+            return driver
+
+    def close(self):
+        """
+        Quit every driver in the pool.
+        """
+        while not self._drivers.empty():
+            try:
+                _quit_driver(self._drivers.get_nowait())
+            except Exception as e:
+                log.error("Error closing driver: %s", e)
+
+
+def fetch_detail(pool, url):
+    """
+    Scrape a single product detail page using a driver from the pool.
+    Args:
+      pool (DriverPool): The pool to borrow a driver from.
+      url (str): The URL of the product page.
+    Returns:
+      dict: The product details, or None if the page could not be scraped.
+    """
+    try:
+        with pool.driver() as driver:
+            driver.get(url)
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.TAG_NAME, "h1"))
+            )
+            detail = driver.execute_script(f"return ({EXTRACT_DETAIL_JS})()")
+    except (TimeoutException, *DRIVER_ERRORS) as e:
+        log.error("Error scraping product details from %s: %s", url, e)
+        return None
+
+    return {"product_url": url, **detail}
+
+
+def scrape_product_details(product_urls, pool_size=DETAIL_POOL_SIZE):
+    """
+    Scrape product detail pages concurrently across a pool of Chrome instances.
+    Args:
+      product_urls (iterable): URLs of the product pages to scrape.
+      pool_size (int): Number of Chrome instances to run in parallel.
+    Returns:
+      list: A list of dictionaries containing the details of each product.
+    """
+    product_urls = [url for url in product_urls if is_allowed(url)]
+    if not product_urls:
+        return []
+
+    pool = DriverPool(pool_size)
+    try:
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            details = executor.map(lambda url: fetch_detail(pool, url), product_urls)
+            return [detail for detail in details if detail]
+    finally:
+        pool.close()
 
 
 def main():
     config = load_config()
-    driver = setup_driver()
 
-    all_products = {}
+    section_files = {}
 
     try:
         for section_name, section_config in config.items():
-            print(f"Scraping {section_name}...")
-            products = scrape_uniqlo_section(driver, section_config)
-            all_products[section_name] = products
-
-            # Save section results
-            save_to_csv(products, f"uniqlo_{section_name}.csv")
-            save_to_json(products, f"uniqlo_{section_name}.json")
+            log.info("Scraping %s...", section_name)
+            driver = None
+            if section_config.get("api_path"):
+                products = scrape_uniqlo_women_tops(
+                    section_config["url"], section_config["api_path"]
+                )
+            else:
+                driver = setup_driver()
+                products = scrape_uniqlo_section(driver, section_config)
+
+            # Save section results as they are scraped
+            jsonl_filename = f"uniqlo_{section_name}.jsonl"
+            saved = save_stream(products, f"uniqlo_{section_name}.csv", jsonl_filename)
+            section_files[section_name] = jsonl_filename if saved else None
+
+            if driver is not None:
+                reset_driver(driver)
+
+            # Visit each product's detail page, if enabled for the section
+            if saved and section_config.get("scrape_details"):
+                with open(jsonl_filename, "rb") as jsonl_file:
+                    product_urls = [
+                        orjson.loads(line)["product_url"] for line in jsonl_file
+                    ]
+                save_stream(
+                    scrape_product_details(product_urls),
+                    f"uniqlo_{section_name}_details.csv",
+                    f"uniqlo_{section_name}_details.jsonl",
+                )
 
         # Save all results in a single file
-        save_to_json(all_products, "uniqlo_all_products.json")
+        merge_jsonl_to_json(section_files, "uniqlo_all_products.json")
 
-        print("Scraping completed. Results saved to CSV and JSON files.")
+        log.info("Scraping completed. Results saved to CSV and JSON files.")
     finally:
-        driver.quit()
-        print("Driver closed")
+        shutdown_driver()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()